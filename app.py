@@ -1,8 +1,17 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
+
+from lib import (
+    SEASONS,
+    WEATHER_CODES,
+    agg_by,
+    corr_chart,
+    day_of_week_chart,
+    hour_chart,
+    kpis,
+    period_chart,
+    season_chart,
+    weather_chart,
+)
 
 # ---------- PAGE CONFIG ----------
 st.set_page_config(
@@ -124,34 +133,6 @@ st.markdown("""
 <hr style="border-color:#1f2933;">
 """, unsafe_allow_html=True)
 
-# ---------- DATA LOADING ----------
-@st.cache_data
-def load_data():
-    df = pd.read_csv("train.csv")
-    df["datetime"] = pd.to_datetime(df["datetime"])
-    df["year"] = df["datetime"].dt.year
-    df["month"] = df["datetime"].dt.month
-    df["day_of_week"] = df["datetime"].dt.day_name()
-    df["hour"] = df["datetime"].dt.hour
-
-    season_map = {1: "spring", 2: "summer", 3: "fall", 4: "winter"}
-    df["season_name"] = df["season"].map(season_map)
-
-    def get_day_period(h):
-        if h < 6:
-            return "night"
-        elif h < 12:
-            return "morning"
-        elif h < 18:
-            return "afternoon"
-        else:
-            return "evening"
-
-    df["day_period"] = df["hour"].apply(get_day_period)
-    return df
-
-df = load_data()
-
 # ---------- SIDEBAR FILTERS ----------
 st.sidebar.header("Filters")
 
@@ -162,14 +143,14 @@ year_opt = st.sidebar.selectbox(
 
 season_opt = st.sidebar.multiselect(
     "Season",
-    options=sorted(df["season_name"].dropna().unique()),
-    default=sorted(df["season_name"].dropna().unique())
+    options=SEASONS,
+    default=SEASONS
 )
 
 weather_opt = st.sidebar.multiselect(
     "Weather category",
-    options=sorted(df["weather"].dropna().unique()),
-    default=sorted(df["weather"].dropna().unique())
+    options=WEATHER_CODES,
+    default=WEATHER_CODES
 )
 
 workingday_map = {"Both": None, "Working days only": 1, "Non-working days only": 0}
@@ -191,42 +172,38 @@ target_choice = st.sidebar.selectbox(
 target_col = "registered" if target_choice == "Registered users" else "count"
 
 # ---------- APPLY FILTERS ----------
-df_filtered = df.copy()
-
-if year_opt != "Both":
-    df_filtered = df_filtered[df_filtered["year"] == year_opt]
-
-df_filtered = df_filtered[df_filtered["season_name"].isin(season_opt)]
-df_filtered = df_filtered[df_filtered["weather"].isin(weather_opt)]
-df_filtered = df_filtered[(df_filtered["hour"] >= min_hour) & (df_filtered["hour"] <= max_hour)]
-
 wd_val = workingday_map[workingday_label]
-if wd_val is not None:
-    df_filtered = df_filtered[df_filtered["workingday"] == wd_val]
+filter_key = (
+    year_opt,
+    tuple(sorted(season_opt)),
+    tuple(sorted(weather_opt)),
+    min_hour,
+    max_hour,
+    wd_val,
+)
+# Only the small cached hourly table is needed to know if any rows match
+has_rows = not agg_by(filter_key, "hour", target_col).empty
 
 # ---------- KPI METRICS (CARD) ----------
 with st.container():
     st.markdown("<div class='card'>", unsafe_allow_html=True)
 
     col_kpi1, col_kpi2, col_kpi3 = st.columns(3)
+    total, mean, peak_hour = kpis(filter_key, target_col)
 
     with col_kpi1:
         st.metric(
             f"Total {target_choice.lower()} (filtered)",
-            f"{df_filtered[target_col].sum():,.0f}"
+            f"{total:,.0f}"
         )
 
     with col_kpi2:
         st.metric(
             f"Average {target_choice.lower()} per hour",
-            f"{df_filtered[target_col].mean():.1f}"
+            f"{mean:.1f}"
         )
 
     with col_kpi3:
-        if not df_filtered.empty:
-            peak_hour = df_filtered.groupby("hour")[target_col].mean().idxmax()
-        else:
-            peak_hour = "-"
         st.metric("Peak hour (filtered)", f"{peak_hour}")
 
     st.markdown("</div>", unsafe_allow_html=True)
@@ -238,12 +215,12 @@ tab1, tab2, tab3 = st.tabs(["Time patterns", "Season & Weather", "Correlations"]
 def chart_with_popover(fig, title: str, btn_key: str):
     col_main, col_btn = st.columns([8, 1])
     with col_main:
-        st.pyplot(fig)
+        st.plotly_chart(fig, key=f"{btn_key}_main")
     with col_btn:
         # invisible popover trigger
         with st.popover("", use_container_width=True, key=f"pop_{btn_key}"):
             st.markdown(f"### {title}", unsafe_allow_html=True)
-            st.pyplot(fig)
+            st.plotly_chart(fig, key=f"{btn_key}_full")
 
         # override popover button style and show custom icon
         st.markdown(
@@ -276,21 +253,7 @@ with tab1:
 
         with col1:
             st.subheader("Mean rentals by hour")
-            fig, ax = plt.subplots()
-            sns.lineplot(
-                data=df_filtered,
-                x="hour",
-                y=target_col,
-                estimator=np.mean,
-                ci=95,
-                marker="o",
-                ax=ax,
-                color="#22c55e"
-            )
-            ax.set_xlabel("Hour of day")
-            ax.set_ylabel("Mean rentals")
-            ax.grid(alpha=0.25)
-            chart_with_popover(fig, "Mean rentals by hour", "hour_pop")
+            chart_with_popover(hour_chart(filter_key, target_col), "Mean rentals by hour", "hour_pop")
             st.markdown(
                 "<p class='chart-caption'>Typical commuter peaks around morning and evening hours.</p>",
                 unsafe_allow_html=True
@@ -298,20 +261,7 @@ with tab1:
 
         with col2:
             st.subheader("Mean rentals by period of day")
-            fig2, ax2 = plt.subplots()
-            order = ["night", "morning", "afternoon", "evening"]
-            sns.barplot(
-                data=df_filtered,
-                x="day_period",
-                y=target_col,
-                estimator=np.mean,
-                ci=95,
-                order=order,
-                palette="Greens"
-            )
-            ax2.set_xlabel("Period of day")
-            ax2.set_ylabel("Mean rentals")
-            chart_with_popover(fig2, "Mean rentals by period of day", "period_pop")
+            chart_with_popover(period_chart(filter_key, target_col), "Mean rentals by period of day", "period_pop")
             st.markdown(
                 "<p class='chart-caption'>Evening and morning windows highlight strong rush-hour usage.</p>",
                 unsafe_allow_html=True
@@ -322,22 +272,7 @@ with tab1:
         with st.container():
             st.markdown("<div class='card'>", unsafe_allow_html=True)
             st.subheader("Hourly rentals by day of week")
-            fig3, ax3 = plt.subplots(figsize=(10, 4))
-            sns.lineplot(
-                data=df_filtered,
-                x="hour",
-                y=target_col,
-                hue="day_of_week",
-                estimator=np.mean,
-                ci=None,
-                marker="o",
-                ax=ax3
-            )
-            ax3.set_xlabel("Hour")
-            ax3.set_ylabel("Mean rentals")
-            ax3.legend(bbox_to_anchor=(1.02, 1), loc="upper left")
-            ax3.grid(alpha=0.25)
-            chart_with_popover(fig3, "Hourly rentals by day of week", "dow_pop")
+            chart_with_popover(day_of_week_chart(filter_key, target_col), "Hourly rentals by day of week", "dow_pop")
             st.markdown(
                 "<p class='chart-caption'>Compare workdays vs weekend profiles to see commuting effects.</p>",
                 unsafe_allow_html=True
@@ -353,19 +288,7 @@ with tab2:
 
         with col4:
             st.subheader("Mean rentals by season")
-            fig4, ax4 = plt.subplots()
-            sns.barplot(
-                data=df_filtered,
-                x="season_name",
-                y=target_col,
-                estimator=np.mean,
-                ci=95,
-                palette="YlGn",
-                ax=ax4
-            )
-            ax4.set_xlabel("Season")
-            ax4.set_ylabel("Mean rentals")
-            chart_with_popover(fig4, "Mean rentals by season", "season_pop")
+            chart_with_popover(season_chart(filter_key, target_col), "Mean rentals by season", "season_pop")
             st.markdown(
                 "<p class='chart-caption'>Warm seasons boost usage; winter typically shows a drop.</p>",
                 unsafe_allow_html=True
@@ -373,19 +296,7 @@ with tab2:
 
         with col5:
             st.subheader("Mean rentals by weather")
-            fig5, ax5 = plt.subplots()
-            sns.barplot(
-                data=df_filtered,
-                x="weather",
-                y=target_col,
-                estimator=np.mean,
-                ci=95,
-                palette="GnBu",
-                ax=ax5
-            )
-            ax5.set_xlabel("Weather category")
-            ax5.set_ylabel("Mean rentals")
-            chart_with_popover(fig5, "Mean rentals by weather", "weather_pop")
+            chart_with_popover(weather_chart(filter_key, target_col), "Mean rentals by weather", "weather_pop")
             st.markdown(
                 "<p class='chart-caption'>Clear days drive more rides; harsh conditions dampen demand.</p>",
                 unsafe_allow_html=True
@@ -399,12 +310,8 @@ with tab3:
         st.markdown("<div class='card'>", unsafe_allow_html=True)
 
         st.subheader("Correlation heatmap (numeric features)")
-        num_cols = df_filtered.select_dtypes(include=["int64", "float64"]).columns
-        if len(num_cols) > 1 and not df_filtered.empty:
-            corr = df_filtered[num_cols].corr()
-            fig6, ax6 = plt.subplots(figsize=(8, 5))
-            sns.heatmap(corr, annot=False, cmap="rocket_r", ax=ax6)
-            chart_with_popover(fig6, "Correlation heatmap", "corr_pop")
+        if has_rows:
+            chart_with_popover(corr_chart(filter_key), "Correlation heatmap", "corr_pop")
             st.markdown(
                 "<p class='chart-caption'>Check how temperature, humidity and other factors move with demand.</p>",
                 unsafe_allow_html=True
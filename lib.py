@@ -0,0 +1,213 @@
+import os
+import tempfile
+from contextlib import suppress
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+# ---------- DATA LOADING ----------
+CSV_PATH = "train.csv"
+PARQUET_PATH = "train.parquet"
+
+SEASONS = ["spring", "summer", "fall", "winter"]
+WEATHER_CODES = [1, 2, 3, 4]
+DAYS_OF_WEEK = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DAY_PERIODS = ["night", "morning", "afternoon", "evening"]
+# Features shown in the correlation heatmap (calendar/code columns are left out)
+NUM_COLS = ["temp", "atemp", "humidity", "windspeed", "casual", "registered", "count"]
+
+def build_parquet():
+    """Derive features from the raw CSV, downcast dtypes and save as Parquet.
+
+    Returns the derived frame, so callers still get the data when the
+    Parquet file cannot be written (e.g. a read-only deploy).
+    """
+    df = pd.read_csv(CSV_PATH, parse_dates=["datetime"])
+    df["year"] = df["datetime"].dt.year
+    df["month"] = df["datetime"].dt.month
+    df["day_of_week"] = df["datetime"].dt.day_name()
+    df["hour"] = df["datetime"].dt.hour
+
+    # season is coded 1-4, so it maps straight onto category codes
+    df["season_name"] = pd.Categorical.from_codes(
+        df["season"].to_numpy() - 1, categories=SEASONS, ordered=True
+    )
+    df["day_period"] = pd.cut(
+        df["hour"],
+        bins=[-1, 5, 11, 17, 23],
+        labels=DAY_PERIODS
+    )
+
+    # Downcast numerics and use categoricals to shrink memory and speed up filters/groupbys
+    for c in df.select_dtypes("integer").columns:
+        df[c] = pd.to_numeric(df[c], downcast="unsigned" if df[c].min() >= 0 else "integer")
+    for c in df.select_dtypes("float").columns:
+        df[c] = pd.to_numeric(df[c], downcast="float")
+    df["day_of_week"] = pd.Categorical(df["day_of_week"], categories=DAYS_OF_WEEK, ordered=True)
+
+    # Write to a temp file and swap it in, so a crash never leaves a truncated
+    # train.parquet that looks newer than its sources
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=PARQUET_PATH + ".",
+            suffix=".tmp",
+            dir=os.path.dirname(os.path.abspath(PARQUET_PATH))
+        )
+        os.close(fd)
+        df.to_parquet(tmp_path, engine="pyarrow", index=False)
+        os.replace(tmp_path, PARQUET_PATH)
+    except OSError:
+        if tmp_path is not None:
+            with suppress(OSError):
+                os.remove(tmp_path)
+    return df
+
+@st.cache_data
+def load_data():
+    # Rebuild the Parquet file on first run or when the CSV or this module has changed
+    if (
+        not os.path.exists(PARQUET_PATH)
+        or os.path.getmtime(PARQUET_PATH) < os.path.getmtime(CSV_PATH)
+        or os.path.getmtime(PARQUET_PATH) < os.path.getmtime(__file__)
+    ):
+        return build_parquet()
+    return pd.read_parquet(PARQUET_PATH, engine="pyarrow")
+
+# ---------- FILTERS ----------
+@st.cache_data
+def filter_df(year_opt, season_opt, weather_opt, min_hour, max_hour, wd_val):
+    df = load_data()
+    # Build one boolean mask on the raw arrays and slice the frame once
+    hour = df["hour"].to_numpy()
+    mask = (
+        df["season_name"].array.isin(season_opt)
+        & np.isin(df["weather"].to_numpy(), weather_opt)
+        & (hour >= min_hour)
+        & (hour <= max_hour)
+    )
+    if year_opt != "Both":
+        mask &= df["year"].to_numpy() == year_opt
+    if wd_val is not None:
+        mask &= df["workingday"].to_numpy() == wd_val
+    # Skip the slice (and its full-frame copy) when every row passes
+    return df if mask.all() else df[mask]
+
+# ---------- AGGREGATES ----------
+@st.cache_data
+def agg_by(filter_key, key, target_col):
+    """Mean, std, count, sum and analytic 95% CI of target_col grouped by key."""
+    agg = filter_df(*filter_key).groupby(key, observed=True)[target_col].agg(["mean", "std", "count", "sum"])
+    agg["ci95"] = 1.96 * agg["std"].fillna(0) / np.sqrt(agg["count"])
+    return agg.reset_index()
+
+def kpis(filter_key, target_col):
+    """Total, mean and peak hour of target_col, read off the cached hourly table."""
+    hourly = agg_by(filter_key, "hour", target_col)
+    if hourly.empty:
+        return 0, float("nan"), "-"
+    total = hourly["sum"].sum()
+    return total, total / hourly["count"].sum(), int(hourly.loc[hourly["mean"].idxmax(), "hour"])
+
+@st.cache_data
+def corr_matrix(filter_key):
+    m = filter_df(*filter_key)[NUM_COLS].to_numpy(dtype=np.float32)
+    # Constant columns (e.g. a single filtered year) yield NaN, as with df.corr()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = np.corrcoef(m, rowvar=False, dtype=np.float32)
+    return pd.DataFrame(corr, index=NUM_COLS, columns=NUM_COLS)
+
+# ---------- CHARTS ----------
+# Figures are cached per filter state so reruns skip Plotly figure construction.
+# Plotly is imported inside the builders so the header, sidebar and KPIs
+# render before the first chart pays for the import.
+def bar_with_ci(agg, x, xlabel, palette):
+    import plotly.express as px
+    # Plot categories as strings so numeric codes (weather) stay discrete
+    agg = agg.assign(**{x: agg[x].astype(str)})
+    fig = px.bar(
+        agg,
+        x=x,
+        y="mean",
+        error_y="ci95",
+        color=x,
+        color_discrete_sequence=getattr(px.colors.sequential, palette)[3:],
+        category_orders={x: list(agg[x])},
+        labels={x: xlabel, "mean": "Mean rentals"}
+    )
+    fig.update_layout(showlegend=False)
+    return fig
+
+@st.cache_data
+def hour_chart(filter_key, target_col):
+    import plotly.graph_objects as go
+    hourly = agg_by(filter_key, "hour", target_col)
+    hours = hourly["hour"].to_numpy()
+    upper = (hourly["mean"] + hourly["ci95"]).to_numpy()
+    lower = (hourly["mean"] - hourly["ci95"]).to_numpy()
+    fig = go.Figure()
+    # Analytic 95% CI band first, so the mean line is drawn on top of it
+    fig.add_trace(go.Scatter(
+        x=np.concatenate([hours, hours[::-1]]),
+        y=np.concatenate([upper, lower[::-1]]),
+        fill="toself",
+        fillcolor="rgba(34, 197, 94, 0.2)",
+        line_width=0,
+        hoverinfo="skip",
+        showlegend=False
+    ))
+    fig.add_trace(go.Scatter(
+        x=hours,
+        y=hourly["mean"],
+        mode="lines+markers",
+        line_color="#22c55e",
+        hovertemplate="Hour of day=%{x}<br>Mean rentals=%{y}<extra></extra>",
+        showlegend=False
+    ))
+    fig.update_layout(xaxis_title="Hour of day", yaxis_title="Mean rentals")
+    return fig
+
+@st.cache_data
+def period_chart(filter_key, target_col):
+    return bar_with_ci(
+        agg_by(filter_key, "day_period", target_col),
+        "day_period",
+        "Period of day",
+        "Greens"
+    )
+
+@st.cache_data
+def day_of_week_chart(filter_key, target_col):
+    import plotly.express as px
+    return px.line(
+        agg_by(filter_key, ["hour", "day_of_week"], target_col),
+        x="hour",
+        y="mean",
+        color="day_of_week",
+        markers=True,
+        labels={"hour": "Hour", "mean": "Mean rentals", "day_of_week": "Day of week"}
+    )
+
+@st.cache_data
+def season_chart(filter_key, target_col):
+    return bar_with_ci(
+        agg_by(filter_key, "season_name", target_col),
+        "season_name",
+        "Season",
+        "YlGn"
+    )
+
+@st.cache_data
+def weather_chart(filter_key, target_col):
+    return bar_with_ci(
+        agg_by(filter_key, "weather", target_col),
+        "weather",
+        "Weather category",
+        "GnBu"
+    )
+
+@st.cache_data
+def corr_chart(filter_key):
+    import plotly.express as px
+    return px.imshow(corr_matrix(filter_key), color_continuous_scale="magma_r", aspect="auto")